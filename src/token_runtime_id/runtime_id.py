@@ -8,19 +8,70 @@ import inspect
 import logging
 import os
 import random
+import threading
+import weakref
 from contextvars import ContextVar
 from typing import TypeVar, ParamSpec, Callable, Any
 
 P = ParamSpec('P')
 R = TypeVar('R')
 
-_RUNTIME_ID_CTX: ContextVar[str | None] = ContextVar("token__runtime__id", default=None)
-_RUNTIME_DEPTH_CTX: ContextVar[int] = ContextVar("token__runtime__depth", default=0)
+class _Frame:
+    """Context state for one decorated call: the ID segments of the context.
+
+    Segments carry their own separators (the root segment includes the root
+    prefix, nested segments a leading separator), so the full ID is a plain
+    ''.join away and nesting never copies the already-built part of the ID.
+    The nesting depth is simply the number of segments.
+    """
+
+    __slots__ = ('segments', 'cached_str')
+
+    def __init__(self, segments: tuple[str, ...]):
+        self.segments = segments
+        self.cached_str: str | None = None
+
+
+_RUNTIME_CTX: ContextVar[_Frame | None] = ContextVar("token__runtime__ctx", default=None)
+
+# Bound methods hoisted once so hot paths skip the attribute lookups.
+_ctx_get = _RUNTIME_CTX.get
+_ctx_set = _RUNTIME_CTX.set
+_ctx_reset = _RUNTIME_CTX.reset
+
+# Flips to True the first time a root runtime ID is created in this process.
+# Until then log filters can skip the ContextVar read entirely; the flag only
+# ever goes one way, so the check is safe without synchronization.
+_EVER_ACTIVE = [False]
+
+# Per-thread RNG instances so fallback generation never contends on the
+# shared module-level Mersenne Twister state.
+_RNG_TLS = threading.local()
+
+
+def _thread_rng() -> random.Random:
+    rng: random.Random | None = getattr(_RNG_TLS, 'rng', None)
+
+    if rng is None:
+        rng = _RNG_TLS.rng = random.Random()
+
+    return rng
+
+
+_DEFAULT_CHARS = "0123456789abcdefghijklmnopqrstuvwxyz"
+# Maps every byte value onto the default alphabet. The modulo bias is acceptable
+# because runtime IDs only need uniqueness, not cryptographic uniformity.
+_DEFAULT_TABLE = bytes(ord(_DEFAULT_CHARS[i % len(_DEFAULT_CHARS)]) for i in range(256))
 
 
 class RuntimeIdException(Exception):
     """Exception raised when runtime ID operations fail."""
 
+def _filter_default(record: logging.LogRecord) -> bool:
+    record.__dict__["runtime_id"] = get_runtime_id() if _EVER_ACTIVE[0] else None
+    return True
+
+
 class RuntimeIdLogFilter(logging.Filter):
     """Logging filter that injects the current runtime ID into log records."""
 
@@ -40,14 +91,250 @@ class RuntimeIdLogFilter(logging.Filter):
 
         self._record_attr_name = record_attr_name
 
+        if record_attr_name == "runtime_id":
+            # Common case: bind a module-level function on the instance so
+            # each record skips the bound-method and attribute-name lookups.
+            self.filter = _filter_default  # pyright: ignore[reportAttributeAccessIssue]
+
     def filter(self, record: logging.LogRecord) -> bool:
-        setattr(record, self._record_attr_name, get_runtime_id())
+        # record_attr_name is a validated identifier and LogRecord has a plain
+        # __dict__, so a direct dict insert skips the descriptor protocol.
+        record.__dict__[self._record_attr_name] = get_runtime_id() if _EVER_ACTIVE[0] else None
         return True
 
 
 
+# Rebuild hooks for decoration-time root prefixes that embed the process id,
+# invoked after fork() so IDs generated in the child carry the child's pid.
+# Keyed weakly by wrapper, so a refresher lives exactly as long as a wrapper
+# using its prefix does and dynamically created decorators are not pinned.
+_PID_PREFIX_REFRESHERS: weakref.WeakKeyDictionary[Callable[..., Any], Callable[[], None]] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _refresh_pid_prefixes() -> None:
+    for refresh in list(_PID_PREFIX_REFRESHERS.values()):
+        refresh()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_refresh_pid_prefixes)
+
+
+def _fast_random_default(length: int) -> str:
+    return os.urandom(length).translate(_DEFAULT_TABLE).decode('ascii')
+
+
+@functools.lru_cache(maxsize=32)
+def _alphabet_table(characters: str) -> bytes | None:
+    """Translation table for a custom alphabet, or None when one cannot be built.
+
+    Only ASCII alphabets whose size divides 256 evenly get a table; for those
+    the byte-to-character mapping is bias-free. Cached so repeated decorators
+    sharing an alphabet build the 256-byte table once.
+    """
+    size = len(characters)
+
+    if 256 % size != 0 or not characters.isascii():
+        return None
+
+    return bytes(ord(characters[i % size]) for i in range(256))
+
+
 def _get_random_string(length: int, characters: str) -> str:
-    return ''.join(random.choices(characters, k=length))
+    if characters is _DEFAULT_CHARS:
+        return _fast_random_default(length)
+
+    table = _alphabet_table(characters)
+
+    if table is not None:
+        return os.urandom(length).translate(table).decode('ascii')
+
+    size = len(characters)
+
+    if size > 256:
+        # A single byte can never index past the first 256 characters, so
+        # large alphabets must be sampled directly.
+        return ''.join(_thread_rng().choices(characters, k=length))
+
+    # One bulk draw instead of a per-character walk through random.choices.
+    # Modulo bias matches the documented tradeoff of the default path.
+    return ''.join([characters[b % size] for b in _thread_rng().randbytes(length)])
+
+
+def _validate_config(
+    *,
+    length: int,
+    prefix_process_id: bool,
+    prefix: str | None,
+    characters: str,
+    max_depth: int,
+    sep: str,
+) -> None:
+    """Validate one decorator configuration."""
+    if not isinstance(length, int) or length <= 0:
+        raise ValueError('length must be an integer greater than 0')
+    if not isinstance(max_depth, int) or max_depth <= 0:
+        raise ValueError('max_depth must be an integer greater than 0')
+    if not isinstance(characters, str) or len(characters) < 1:
+        raise ValueError('characters must be a non-empty string')
+    if not isinstance(sep, str) or len(sep) < 1:
+        raise ValueError('sep must be a non-empty string')
+    if not isinstance(prefix_process_id, bool):
+        raise ValueError('prefix_process_id must be a boolean')
+    if prefix is not None and (not isinstance(prefix, str) or len(prefix) < 1):
+        raise ValueError('prefix must be None or a non-empty string')
+
+
+# typed=True keeps bool and int arguments distinct in the cache key, so a
+# validated prefix_process_id=True entry cannot mask an invalid integer 1.
+@functools.lru_cache(maxsize=128, typed=True)
+def _validate_config_cached(
+    *,
+    length: int,
+    prefix_process_id: bool,
+    prefix: str | None,
+    characters: str,
+    max_depth: int,
+    sep: str,
+) -> None:
+    """Cached validation, so modules that decorate many functions with the
+    same arguments only pay the isinstance checks once per distinct
+    configuration. Only usable with hashable arguments.
+    """
+    _validate_config(
+        length=length,
+        prefix_process_id=prefix_process_id,
+        prefix=prefix,
+        characters=characters,
+        max_depth=max_depth,
+        sep=sep,
+    )
+
+
+def _build_wrapper(
+    method: Callable[P, R],
+    *,
+    length: int,
+    root_prefix_cell: list[str],
+    characters: str,
+    max_depth: int,
+    sep: str,
+) -> Callable[P, R]:
+    """Build a wrapper specialized for one decorator configuration.
+
+    All configuration is evaluated once here, so the per-call path carries
+    no branches on decoration-time constants. The root prefix lives in a
+    one-element cell so it can be rebuilt after fork().
+    """
+    def _enter_frame() -> _Frame:
+        frame = _ctx_get()
+
+        if frame is None:
+            segments = (root_prefix_cell[0] + _get_random_string(length, characters),)
+
+            if not _EVER_ACTIVE[0]:
+                _EVER_ACTIVE[0] = True
+        else:
+            depth = len(frame.segments)
+
+            if depth >= max_depth:
+                raise RuntimeIdException(
+                    f"Max depth of {max_depth} is reached. Current id {''.join(frame.segments)}, depth {depth}"
+                )
+
+            segments = frame.segments + (sep + _get_random_string(length, characters),)
+
+        # A fresh frame per call: context snapshots (copy_context, asyncio
+        # tasks) may hold a reference long after this wrapper returns, so
+        # frames must never be reused.
+        return _Frame(segments)
+
+    if inspect.iscoroutinefunction(method):
+        @functools.wraps(method)
+        async def async_wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            token = _ctx_set(_enter_frame())
+
+            try:
+                return await method(*args, **kwargs)
+            finally:
+                _ctx_reset(token)
+
+        return async_wrapper  # pyright: ignore[reportReturnType]
+
+    @functools.wraps(method)
+    def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+        token = _ctx_set(_enter_frame())
+
+        try:
+            return method(*args, **kwargs)
+        finally:
+            _ctx_reset(token)
+
+    return wrapper
+
+
+def _make_decorator(
+    *,
+    length: int,
+    prefix_process_id: bool,
+    prefix: str | None,
+    characters: str,
+    max_depth: int,
+    sep: str,
+) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    """Validate the configuration once and return a ready-to-apply decorator."""
+    try:
+        _validate_config_cached(
+            length=length,
+            prefix_process_id=prefix_process_id,
+            prefix=prefix,
+            characters=characters,
+            max_depth=max_depth,
+            sep=sep,
+        )
+    except TypeError:
+        # Unhashable arguments cannot go through the cache; validate them
+        # directly so they still fail with the documented ValueError.
+        _validate_config(
+            length=length,
+            prefix_process_id=prefix_process_id,
+            prefix=prefix,
+            characters=characters,
+            max_depth=max_depth,
+            sep=sep,
+        )
+
+    root_prefix_cell = [""]
+
+    def _rebuild_root_prefix() -> None:
+        pid_part = f"{os.getpid()}{sep}" if prefix_process_id else ""
+        prefix_part = f"{prefix}{sep}" if prefix else ""
+        root_prefix_cell[0] = pid_part + prefix_part
+
+    _rebuild_root_prefix()
+
+    def _decorator(method: Callable[P, R]) -> Callable[P, R]:
+        wrapper = _build_wrapper(
+            method,
+            length=length,
+            root_prefix_cell=root_prefix_cell,
+            characters=characters,
+            max_depth=max_depth,
+            sep=sep,
+        )
+
+        if prefix_process_id:
+            # Re-derive the prefix at application time (covers decorators
+            # created before a fork and applied after) and register the
+            # refresher against the wrapper that keeps the prefix alive.
+            _rebuild_root_prefix()
+            _PID_PREFIX_REFRESHERS[wrapper] = _rebuild_root_prefix
+
+        return wrapper
+
+    return _decorator
 
 
 def runtime_id(
@@ -56,7 +343,7 @@ def runtime_id(
     length: int = 8,
     prefix_process_id: bool = False,
     prefix: str | None = None,
-    characters: str = "0123456789abcdefghijklmnopqrstuvwxyz",
+    characters: str = _DEFAULT_CHARS,
     max_depth: int = 3,
     sep: str = ":",
 ) -> Any:
@@ -104,91 +391,34 @@ def runtime_id(
             ...     print(get_runtime_id())
             # Output: roothash:childhash
     """
-    if method is None:
-        return functools.partial(  # pyright: ignore[reportReturnType]
-            runtime_id,
-            length=length,
-            prefix_process_id=prefix_process_id,
-            prefix=prefix,
-            characters=characters,
-            max_depth=max_depth,
-            sep=sep
-        )
-
-    if not isinstance(length, int) or length <= 0:
-        raise ValueError('length must be an integer greater than 0')
-    if not isinstance(max_depth, int) or max_depth <= 0:
-        raise ValueError('max_depth must be an integer greater than 0')
-    if not isinstance(characters, str) or len(characters) < 1:
-        raise ValueError('characters must be a non-empty string')
-    if not isinstance(sep, str) or len(sep) < 1:
-        raise ValueError('sep must be a non-empty string')
-    if not isinstance(prefix_process_id, bool):
-        raise ValueError('prefix_process_id must be a boolean')
-    if prefix is not None and (not isinstance(prefix, str) or len(prefix) < 1):
-        raise ValueError('prefix must be None or a non-empty string')
-
-
-    def _push_ids() -> tuple:  # pyright: ignore[reportMissingTypeArgument]
-        rid = get_runtime_id()
-
-        if rid is None:
-            rid = ""
-            depth = 0
-
-            if prefix_process_id:
-                rid += str(os.getpid()) + sep
-            if prefix:
-                rid += prefix + sep
-        else:
-            depth = _RUNTIME_DEPTH_CTX.get()
-
-            if depth >= max_depth:
-                raise RuntimeIdException(f"Max depth of {max_depth} is reached. Current id {rid}, depth {depth}")
-
-            rid += sep
-
-        rid += _get_random_string(length, characters)
-
-        return (
-            _RUNTIME_ID_CTX.set(rid),
-            _RUNTIME_DEPTH_CTX.set(depth + 1)
-        )
-
-    def _pop_ids(tokens: tuple) -> None:  # pyright: ignore[reportMissingTypeArgument]
-        _RUNTIME_ID_CTX.reset(tokens[0])
-        _RUNTIME_DEPTH_CTX.reset(tokens[1])
+    decorator = _make_decorator(
+        length=length,
+        prefix_process_id=prefix_process_id,
+        prefix=prefix,
+        characters=characters,
+        max_depth=max_depth,
+        sep=sep,
+    )
 
+    if method is None:
+        return decorator
 
-    if inspect.iscoroutinefunction(method):
-        @functools.wraps(method)
-        async def async_wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
-            tokens = _push_ids()
+    return decorator(method)
 
-            try:
-                return await method(*args, **kwargs)
-            finally:
-                _pop_ids(tokens)
 
-        wrapper_method = async_wrapper
-    else:
-        @functools.wraps(method)
-        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
-            tokens = _push_ids()
-
-            try:
-                return method(*args, **kwargs)
-            finally:
-                _pop_ids(tokens)
+def get_runtime_id() -> str | None:
+    """Retrieves the current Runtime ID from the context."""
+    frame = _ctx_get()
 
-        wrapper_method = wrapper
+    if frame is None:
+        return None
 
-    return wrapper_method
+    rid = frame.cached_str
 
+    if rid is None:
+        rid = frame.cached_str = ''.join(frame.segments)
 
-def get_runtime_id() -> str | None:
-    """Retrieves the current Runtime ID from the context."""
-    return _RUNTIME_ID_CTX.get()
+    return rid
 
 def require_runtime_id() -> str:
     """Retrieves the ID or raises an exception if not set."""
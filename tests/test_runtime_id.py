@@ -1,4 +1,5 @@
 # pylint: disable=missing-function-docstring,missing-module-docstring
+import contextvars
 import inspect
 import logging
 import os
@@ -11,6 +12,7 @@ from token_runtime_id import (
     RuntimeIdException,
     RuntimeIdLogFilter,
 )
+from token_runtime_id.runtime_id import _refresh_pid_prefixes
 
 
 def test__get_runtime_id__returns_none_when_not_set() -> None:
@@ -99,6 +101,27 @@ def test__runtime_id__without_process_id_prefix() -> None:
     assert str(os.getpid()) not in rid
 
 
+def test__runtime_id__pid_prefix_refreshed_after_fork(monkeypatch: pytest.MonkeyPatch) -> None:
+    @runtime_id(prefix_process_id=True)
+    def sample_function() -> str | None:
+        return get_runtime_id()
+
+    rid = sample_function()
+    assert rid is not None
+    assert rid.startswith(f"{os.getpid()}:")
+
+    with monkeypatch.context() as patched:
+        patched.setattr(os, "getpid", lambda: 424242)
+        _refresh_pid_prefixes()
+
+        rid = sample_function()
+        assert rid is not None
+        assert rid.startswith("424242:")
+
+    # Restore the real pid in every registered prefix for later tests.
+    _refresh_pid_prefixes()
+
+
 def test__runtime_id__with_custom_prefix() -> None:
     @runtime_id(prefix="test", prefix_process_id=False)
     def sample_function() -> str | None:
@@ -286,6 +309,18 @@ def test__runtime_id__invalid_prefix() -> None:
             pass
 
 
+def test__runtime_id__invalid_unhashable_arguments() -> None:
+    with pytest.raises(ValueError, match="characters must be a non-empty string"):
+        @runtime_id(characters=["a", "b"])  # type: ignore
+        def sample_function() -> None:
+            pass
+
+    with pytest.raises(ValueError, match="length must be an integer greater than 0"):
+        @runtime_id(length=[8])  # type: ignore
+        def other_function() -> None:
+            pass
+
+
 def test__runtime_id__invalid_prefix_process_id() -> None:
     with pytest.raises(ValueError, match="prefix_process_id must be a boolean"):
         @runtime_id(prefix_process_id="true")  # type: ignore
@@ -304,6 +339,65 @@ def test__runtime_id__with_custom_characters() -> None:
     assert all(c in "ABC" for c in rid)
 
 
+def test__runtime_id__context_snapshot_survives_later_calls() -> None:
+    @runtime_id
+    def first_function() -> tuple[contextvars.Context, str | None]:
+        return contextvars.copy_context(), get_runtime_id()
+
+    @runtime_id
+    def second_function() -> str | None:
+        return get_runtime_id()
+
+    snapshot, first_rid = first_function()
+    second_rid = second_function()
+
+    assert first_rid is not None
+    assert second_rid != first_rid
+    assert snapshot.run(get_runtime_id) == first_rid
+
+
+def test__runtime_id__with_power_of_two_characters() -> None:
+    @runtime_id(prefix_process_id=False, characters="0123456789abcdef", length=12)
+    def sample_function() -> str | None:
+        return get_runtime_id()
+
+    rid = sample_function()
+
+    assert rid is not None
+    assert len(rid) == 12
+    assert all(c in "0123456789abcdef" for c in rid)
+
+
+def test__runtime_id__with_more_than_256_characters() -> None:
+    characters = ''.join(chr(0x100 + i) for i in range(300))
+
+    @runtime_id(prefix_process_id=False, characters=characters, length=64)
+    def sample_function() -> str | None:
+        return get_runtime_id()
+
+    seen = set()
+
+    for _ in range(50):
+        rid = sample_function()
+        assert rid is not None
+        assert all(c in characters for c in rid)
+        seen.update(rid)
+
+    # The whole alphabet must be reachable, including characters past index 255.
+    assert any(characters.index(c) >= 256 for c in seen)
+
+
+def test__runtime_id__default_characters_only() -> None:
+    @runtime_id(prefix_process_id=False, length=32)
+    def sample_function() -> str | None:
+        return get_runtime_id()
+
+    rid = sample_function()
+
+    assert rid is not None
+    assert all(c in "0123456789abcdefghijklmnopqrstuvwxyz" for c in rid)
+
+
 def test__runtime_id__sanity_check_100_unique_values() -> None:
     @runtime_id
     def sample_function() -> str | None: